@@ -1,8 +1,33 @@
 import os  
 import json  # for serializing metadata to JSON format
+import hashlib  # for content-addressed caching of results
 import streamlit as st  # for building the web interface
 from metadata_generator import generate_metadata  
 
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_generate(
+    digest: str,
+    filename: str,
+    _data: bytes,
+    summary_sentences: int,
+    keyword_count: int
+) -> dict:
+    """
+    Run `generate_metadata` once per distinct upload.
+
+    Streamlit keys the cache on `digest` (a hash of the file content) and the
+    other arguments; `_data` is excluded from hashing by its leading
+    underscore, so large uploads are not re-hashed by Streamlit.
+    """
+    return generate_metadata(
+        filename,
+        summary_sentences=summary_sentences,
+        keyword_count=keyword_count,
+        data=_data
+    )
+
+
 # Configure the Streamlit app's basic properties
 st.set_page_config(
     page_title="Auto Metadata Generator",  # title of the browser tab
@@ -27,25 +52,19 @@ uploaded = st.file_uploader(
 
 # process it
 if uploaded:
-    # Create a temporary directory (if it doesn't exist) to store the uploaded file
-    tmp_dir = "temp_uploads"
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    # Build the full path for saving the uploaded file locally
-    tmp_path = os.path.join(tmp_dir, uploaded.name)
-
-    # Write the uploaded file's bytes to disk for downstream processing
-    with open(tmp_path, "wb") as f:
-        f.write(uploaded.getbuffer())
-
     # Processing has started
     st.info(f"Processing **{uploaded.name}** …")
 
     # Call the metadata generation routine
     # summary_sentences: number of sentences in the generated summary (modifiable)
     # keyword_count: maximum number of keywords to extract (also adjustable)
-    meta = generate_metadata(
-        tmp_path,
+    # The upload is processed straight from memory; no copy is written to disk.
+    # Results are cached by content hash, so re-uploading a file is instant.
+    data = uploaded.getvalue()
+    meta = _cached_generate(
+        hashlib.blake2b(data, digest_size=16).hexdigest(),
+        uploaded.name,
+        data,
         summary_sentences=3,
         keyword_count=10
     )
@@ -120,10 +139,3 @@ if uploaded:
         file_name=f"{os.path.splitext(meta['filename'])[0]}_metadata.json",
         mime="application/json"
     )
-
-    # Cleanup temporary file 
-    try:
-        os.remove(tmp_path)  # delete the file after processing to save disk space
-    except Exception:
-        # If cleanup fails, proceed silently (no user-facing error)
-        pass
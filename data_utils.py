@@ -1,80 +1,200 @@
+import io  # to wrap in-memory uploads as file-like objects
 import os  
+import shutil  # to stream in-memory PDFs to disk in chunks
+import tempfile  # scratch directory for rendered OCR page images
+from concurrent.futures import ThreadPoolExecutor  # to OCR scanned pages in parallel
 from datetime import datetime  # for parsing and formatting dates
-from typing import Dict  # for type hinting the metadata dictionaries
+from typing import TYPE_CHECKING, BinaryIO, Dict, Optional, Tuple, Union  # for type hinting
 
-from docx import Document  # to read DOCX document content
-from docx import Document as DocxDocument  # alias for metadata extraction to avoid confusion
-from PyPDF2 import PdfReader  # to extract text and metadata from PDF files
-from PyPDF2 import PdfReader as PDFReader  
-from pdf2image import convert_from_path  # to convert PDF pages to images for OCR fallback
-import pytesseract  # to perform OCR on images when PDF text extraction fails
+if TYPE_CHECKING:
+    import fitz
 
+# Extractors accept either a filepath or an open binary file-like object
+Source = Union[str, BinaryIO]
 
-def extract_text_from_txt(path: str) -> str:
+# Chunk size used when spilling an in-memory document to disk
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Tesseract options: LSTM engine only, page treated as one uniform text block
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# Format-specific libraries (python-docx, PyMuPDF, pdf2image, pytesseract,
+# Pillow) are imported inside the functions that need them, so e.g. a TXT
+# upload never pays the import cost of the PDF/OCR stack.
+
+
+def extract_text_from_txt(source: Source) -> str:
     """Read the entire content of a plain-text (.txt) file.
 
     Parameters:
-        path: str - filepath to the .txt document
+        source: str | BinaryIO - filepath or binary file-like of the .txt document
     Returns:
         str: full text content of the file
     """
     # Open in text mode with UTF-8, ignoring any decode errors
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read()
-
-
-def extract_text_from_docx(path: str) -> str:
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    # Decode the stream the same way, without closing the caller's object
+    wrapper = io.TextIOWrapper(source, encoding='utf-8', errors='ignore')
+    try:
+        return wrapper.read()
+    finally:
+        wrapper.detach()
+
+
+def extract_text_from_docx(source: Source) -> str:
     """Extract and concatenate text from all paragraphs in a .docx document.
 
     Parameters:
-        path: str - filepath to the DOCX file
+        source: str | BinaryIO - filepath or binary file-like of the DOCX file
     Returns:
         str: newline-separated paragraph texts
     """
-    doc = Document(path)  
+    from docx import Document  # to read DOCX document content
+
+    doc = Document(source)  # python-docx accepts paths and streams alike
     # Join each paragraph's text with newline separators to preserve simple structure
     return "\n".join(para.text for para in doc.paragraphs)
 
 
-def extract_text_from_pdf(path: str) -> str:
+def _ocr_page(image_path: str) -> str:
+    """OCR a single rendered page image, deleting the image afterwards.
+
+    Parameters:
+        image_path: str - filepath to the page image written by pdf2image
+    Returns:
+        str: text recognised by tesseract
     """
-    Extract text from a PDF, with a fallback to OCR if needed.
+    import pytesseract  # to perform OCR on images when PDF text extraction fails
+    from PIL import Image  # to load rendered page images for OCR
+
+    try:
+        # Only this page's pixels are held in memory while it is recognised
+        with Image.open(image_path) as img:
+            return pytesseract.image_to_string(img, config=TESSERACT_CONFIG)
+    finally:
+        os.remove(image_path)
+
+
+def _open_pdf(source: Source) -> "fitz.Document":
+    """Open a PDF with PyMuPDF from a filepath or an in-memory stream."""
+    import fitz  # PyMuPDF, to extract text and metadata from PDF files
+
+    if isinstance(source, str):
+        return fitz.open(source)
+    if isinstance(source, io.BytesIO):
+        # A BytesIO built from bytes hands back that same object here, so
+        # the upload is not copied again
+        return fitz.open(stream=source.getvalue(), filetype="pdf")
+    source.seek(0)
+    return fitz.open(stream=source.read(), filetype="pdf")
+
+
+def _ocr_pdf(source: Source) -> str:
+    """
+    OCR every page of a scanned PDF.
+
+    Pages are rendered to disk and recognised one image at a time per
+    worker, in parallel across CPU cores. In-memory input is written to a
+    temporary file first, since poppler needs a path.
+
+    Parameters:
+        source: str | BinaryIO - filepath or binary file-like of the PDF document
+    Returns:
+        str: OCR-generated text, pages separated by newlines
+    """
+    from pdf2image import convert_from_path  # to convert PDF pages to images for OCR fallback
+
+    # One tesseract per core; run with OMP_THREAD_LIMIT=1 (set process-wide
+    # in the Dockerfile) so each of them does not also start an OpenMP
+    # thread per core
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        if isinstance(source, str):
+            path = source
+        else:
+            path = os.path.join(tmp, "source.pdf")
+            source.seek(0)
+            # Stream in fixed-size chunks rather than one full-size write
+            with open(path, "wb") as f:
+                shutil.copyfileobj(source, f, length=COPY_CHUNK_BYTES)
+        # Render PDF pages at 300 DPI for better OCR accuracy, letting
+        # poppler work on several pages at once. Pages are rendered as
+        # grayscale, which is what tesseract works on anyway. Only file
+        # paths come back, so the whole document is never held in memory
+        # as images.
+        image_paths = convert_from_path(
+            path,
+            dpi=300,
+            thread_count=workers,
+            grayscale=True,
+            output_folder=tmp,
+            fmt="png",
+            paths_only=True,
+        )
+        # pytesseract runs every page in its own tesseract child process,
+        # so threads are enough to keep all cores busy without forking
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            ocr_pages = list(ex.map(_ocr_page, image_paths))
+    return "\n".join(ocr_pages)
+
+
+def extract_pdf(source: Source) -> Tuple[str, Dict[str, str]]:
+    """
+    Extract both the text and the embedded metadata of a PDF in one pass.
+
+    The PDF is opened once and read by a single `fitz.Document` on the
+    calling thread; PyMuPDF must not be used from several threads at once.
 
     Steps:
-    1. Use PyPDF2 to extract text from each page.
+    1. Use PyMuPDF to read the information dictionary and the text of each page.
     2. If the combined text is very short (<100 chars), assume scanned PDF
        and perform OCR via pytesseract on images generated by pdf2image.
 
     Parameters:
-        path: str - filepath to the PDF document
+        source: str | BinaryIO - filepath or binary file-like of the PDF document
     Returns:
-        str: extracted or OCR-generated text
+        Tuple[str, Dict[str, str]]: extracted or OCR-generated text, and a
+        dict with 'author' and 'created_at'
     """
-    # Initialize PDF reader 
-    reader = PdfReader(path)
-    text_pages = [page.extract_text() or "" for page in reader.pages]
-    joined = "\n".join(text_pages).strip()
+    # Open the PDF with PyMuPDF and pull metadata plus the text layer
+    doc = _open_pdf(source)
+    try:
+        info = doc.metadata or {}
+        joined = "\n".join(page.get_text("text") for page in doc).strip()
+    finally:
+        doc.close()
 
     # If less than threshold, perform OCR on each rendered page
     if len(joined) < 100:
-        ocr_pages = []
-        # Convert PDF pages to PIL images at 300 DPI for better OCR accuracy
-        images = convert_from_path(path, dpi=300)
-        for img in images:
-            # Append OCR result for each page
-            ocr_pages.append(pytesseract.image_to_string(img))
-        joined = "\n".join(ocr_pages)
-    return joined
+        joined = _ocr_pdf(source)
+    return joined, _pdf_info_metadata(info)
+
+
+def extract_text_from_pdf(source: Source) -> str:
+    """
+    Extract text from a PDF, with a fallback to OCR if needed.
 
+    See `extract_pdf`, which also returns the embedded metadata.
 
-def extract_text(path: str) -> str:
+    Parameters:
+        source: str | BinaryIO - filepath or binary file-like of the PDF document
+    Returns:
+        str: extracted or OCR-generated text
+    """
+    return extract_pdf(source)[0]
+
+
+def extract_text(path: str, data: Optional[bytes] = None) -> str:
     """
     Dispatch text extraction based on file extension.
 
     Determines the correct extractor for .txt, .docx, and .pdf files.
 
     Parameters:
-        path: str - filepath to the document
+        path: str - filepath to the document, or just its name when `data` is given
+        data: Optional[bytes] - file content already in memory; read instead of `path`
     Returns:
         str: extracted text
 
@@ -82,73 +202,77 @@ def extract_text(path: str) -> str:
         ValueError: if file extension is unsupported
     """
     ext = os.path.splitext(path)[1].lower()
+    source = path if data is None else io.BytesIO(data)
     if ext == ".txt":
-        return extract_text_from_txt(path)
+        return extract_text_from_txt(source)
     elif ext == ".docx":
-        return extract_text_from_docx(path)
+        return extract_text_from_docx(source)
     elif ext == ".pdf":
-        return extract_text_from_pdf(path)
+        return extract_text_from_pdf(source)
     else:
         # Signal unsupported formats early
         raise ValueError(f"Unsupported file type: {ext}")
 
 
-def get_pdf_metadata(path: str) -> Dict[str, str]:
-    """Extract built-in metadata (author, creation date) from a PDF file.
-
-    Handles both attribute-based and dictionary-based metadata representations.
+def _parse_pdf_date(raw: str) -> str:
+    """Convert a PDF date string such as 'D:20240101120000+01'00'' to ISO format.
 
     Parameters:
-        path: str - filepath to the PDF
+        raw: str - date string from the PDF information dictionary
     Returns:
-        Dict[str, str]: keys 'author' and 'created_at' with ISO-formatted values
+        str: ISO-formatted datetime, or the raw value if it cannot be parsed
     """
-    reader = PDFReader(path)  
-    info = reader.metadata or {}
+    # PDF date strings often start with 'D:', strip if present
+    s = raw[2:] if raw.startswith("D:") else raw
+    # Parse standard PDF date format 'YYYYMMDDHHMMSS'
+    try:
+        return datetime.strptime(s[:14], "%Y%m%d%H%M%S").isoformat()
+    except ValueError:
+        # Fallback to raw string if parsing fails
+        return s
 
-    # Determine author from either attribute or dict keys
-    if hasattr(info, "author"):
-        author = info.author or ""
-    else:
-        author = info.get("author") or info.get("/Author") or ""
 
-    # Extract raw creation date, handling attribute or dict styles
-    raw = None
-    if hasattr(info, "creation_date"):
-        raw = info.creation_date
-    else:
-        raw = info.get("creation_date") or info.get("/CreationDate")
+def _pdf_info_metadata(info: Dict[str, str]) -> Dict[str, str]:
+    """Map a PyMuPDF information dictionary to 'author' and 'created_at'.
 
-    created_at = ""
-    if raw:
-        # If already a datetime, convert directly
-        if isinstance(raw, datetime):
-            created_at = raw.isoformat()
-        else:
-            # PDF date strings often start with 'D:', strip if present
-            s = str(raw)
-            if s.startswith("D:"):
-                s = s[2:]
-            # Parse standard PDF date format 'YYYYMMDDHHMMSS'
-            try:
-                created_at = datetime.strptime(s[:14], "%Y%m%d%H%M%S").isoformat()
-            except Exception:
-                # Fallback to raw string if parsing fails
-                created_at = s
+    PyMuPDF exposes the information dictionary as a plain dict of strings
+    (empty when a field is absent), so no other metadata shapes need handling.
+    """
+    author = info.get("author", "") or ""
+    raw = info.get("creationDate", "") or ""
+    created_at = _parse_pdf_date(raw) if raw else ""
     return {"author": author, "created_at": created_at}
 
 
-def get_docx_metadata(path: str) -> Dict[str, str]:
+def get_pdf_metadata(source: Source) -> Dict[str, str]:
+    """Extract built-in metadata (author, creation date) from a PDF file.
+
+    Parameters:
+        source: str | BinaryIO - filepath or binary file-like of the PDF
+    Returns:
+        Dict[str, str]: keys 'author' and 'created_at' with ISO-formatted values
+    """
+    doc = _open_pdf(source)
+    try:
+        info = doc.metadata or {}
+    finally:
+        doc.close()
+    return _pdf_info_metadata(info)
+
+
+def get_docx_metadata(source: Source) -> Dict[str, str]:
     """Extract built-in metadata (author, creation date) from a DOCX file.
 
     Leverages python-docx core properties for metadata.
 
     Parameters:
-        path: str - filepath to the DOCX file
+        source: str | BinaryIO - filepath or binary file-like of the DOCX file
     Returns:
         Dict[str, str]: keys 'author' and 'created_at'
     """
-    doc = DocxDocument(path)  # load document for metadata access
+    from docx import Document  # to read DOCX core properties
+
+    doc = Document(source)  # load document for metadata access
     props = doc.core_properties
     author = props.author or ""
     created_at = ""
@@ -160,27 +284,55 @@ def get_docx_metadata(path: str) -> Dict[str, str]:
     return {"author": author, "created_at": created_at}
 
 
-def get_file_metadata(path: str) -> Dict[str, str]:
+def get_file_metadata(path: str, data: Optional[bytes] = None) -> Dict[str, str]:
     """
     Dispatch embedded metadata extraction based on file extension.
 
     Returns a consistent dict for author and creation date.
 
     Parameters:
-        path: str - filepath to the document
+        path: str - filepath to the document, or just its name when `data` is given
+        data: Optional[bytes] - file content already in memory; read instead of `path`
     Returns:
         Dict[str, str]: metadata dict with 'author' and 'created_at'
     """
     ext = os.path.splitext(path)[1].lower()
+    source = path if data is None else io.BytesIO(data)
     if ext == ".pdf":
-        return get_pdf_metadata(path)
+        return get_pdf_metadata(source)
     elif ext == ".docx":
-        return get_docx_metadata(path)
+        return get_docx_metadata(source)
     else:
         # Other formats have no embedded metadata
         return {"author": "", "created_at": ""}
 
 
+def extract_text_and_metadata(
+    path: str,
+    data: Optional[bytes] = None
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Extract text and embedded metadata together, dispatching on extension.
+
+    PDFs are read through a single PyMuPDF document (see `extract_pdf`);
+    other formats use `extract_text` and `get_file_metadata`.
+
+    Parameters:
+        path: str - filepath to the document, or just its name when `data` is given
+        data: Optional[bytes] - file content already in memory; read instead of `path`
+    Returns:
+        Tuple[str, Dict[str, str]]: extracted text and metadata dict with
+        'author' and 'created_at'
+
+    Raises:
+        ValueError: if file extension is unsupported
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        return extract_pdf(path if data is None else io.BytesIO(data))
+    return extract_text(path, data=data), get_file_metadata(path, data=data)
+
+
 if __name__ == "__main__":
     # Command-line interface for quick manual testing
     import sys
@@ -1,22 +1,38 @@
 import os  
 import json  
-from typing import Any, Dict  # for type annotations of metadata dictionary
+import re  
+from concurrent.futures import ThreadPoolExecutor  # to overlap independent extraction steps
+from typing import Any, Dict, Optional  # for type annotations of metadata dictionary
 
-from data_utils import extract_text, get_file_metadata  # utilities for text and basic metadata extraction
+from data_utils import extract_text_and_metadata  # utilities for text and basic metadata extraction
 from nlp_utils import (
+    analyze,
+    clean_text,
     extract_keywords,  
-    extract_summary,   
-    extract_entities,  
+    summarize_sentences,
     extract_sections,  
+    load_nlp,
 )
 from langdetect import detect  # language detection library for raw text
 
+# Leading characters sampled for language detection; a couple of KB is
+# plenty of signal and keeps detection cost independent of document size
+LANG_SAMPLE_CHARS = 2000
+
+# Leading characters scanned for the title block; far more than a
+# `max_words` title needs, and keeps title detection O(1) in document size
+TITLE_SCAN_CHARS = 4096
+
+# Whitespace-delimited word, matching the tokens produced by str.split()
+_WORD = re.compile(r"\S+")
+
 
 def _detect_title(text: str, max_words: int = 20) -> str:
     """
     Heuristic title detection based on the first non-empty block of text.
 
-    1. Split text into lines and collect lines until the first blank line.
+    1. Split the opening TITLE_SCAN_CHARS characters into lines and collect
+       lines until the first blank line.
     2. Join those lines as the title candidate.
     3. If the candidate exceeds `max_words`, truncate and append an ellipsis.
 
@@ -26,11 +42,16 @@ def _detect_title(text: str, max_words: int = 20) -> str:
     Returns:
         A string representing the inferred title (possibly truncated)
     """
-    lines = text.splitlines()
+    # Only the top of the document can hold the title; cut at the first
+    # blank line when there is one, so the rest is never split into lines
+    head = text[:TITLE_SCAN_CHARS]
+    end = head.find("\n\n")
+    if end != -1:
+        head = head[:end]
 
     # Gather lines until an empty line signifies end of title block
     block = []
-    for line in lines:
+    for line in head.splitlines():
         stripped = line.strip()
         if not stripped:
             break
@@ -47,59 +68,92 @@ def _detect_title(text: str, max_words: int = 20) -> str:
     return title_candidate
 
 
+def _detect_language(text: str) -> str:
+    """
+    Identify the document language from its opening text.
+
+    Parameters:
+        text: full document text
+    Returns:
+        ISO 639-1 language code, or 'unknown' if detection fails
+    """
+    try:
+        return detect(text[:LANG_SAMPLE_CHARS])
+    except Exception:
+        return "unknown"
+
+
 def generate_metadata(
     path: str,
     summary_sentences: int = 3,
     keyword_count: int = 10,
-    wpm: int = 200
+    wpm: int = 200,
+    data: Optional[bytes] = None
 ) -> Dict[str, Any]:
     """
     Generate structured metadata for a given document.
 
+    Steps 1-2 read the file once on the calling thread; steps 3-5 are
+    independent and run concurrently on a thread pool.
+
     Steps:
     1. Extract embedded file metadata (author, creation date).
     2. Extract raw text content (with OCR fallback for PDFs).
-    3. Detect document language.
+    3. Detect document language from the first LANG_SAMPLE_CHARS characters.
     4. Infer a title via heuristic.
     5. Perform NLP analyses: keywords, summary, entities, sections.
     6. Compute word count and estimated reading time.
     7. Assemble all details into a metadata dictionary.
 
     Parameters:
-        path: filepath to the document
+        path: filepath to the document, or just its filename when `data` is given
         summary_sentences: number of sentences for summary output
         keyword_count: maximum number of keywords to extract
         wpm: words-per-minute reading speed for time estimate
+        data: document content already in memory (e.g. an upload); when given,
+            nothing is read from `path`
     Returns:
         Dict[str, Any]: metadata including filename, type, text analytics, and file metadata
     """
-    # Get embedded metadata from file (author, creation date)
-    file_meta = get_file_metadata(path)
-
-    # Extract the full raw text content from the file
-    raw = extract_text(path)
-
-    # Identify the document language; fallback to 'unknown'
-    try:
-        language = detect(raw)
-    except Exception:
-        language = "unknown"
+    # Extract the raw text (with OCR fallback) and embedded metadata (author,
+    # creation date). PDFs are read through one PyMuPDF document, which must
+    # stay on a single thread, so this is not handed to the pool.
+    raw, file_meta = extract_text_and_metadata(path, data=data)
+
+    # Fetch the cached spaCy pipeline here: Streamlit's cache (and its
+    # first-load spinner) needs the script thread, not a pool worker
+    nlp = load_nlp()
+
+    with ThreadPoolExecutor() as ex:
+        # Normalize whitespace once for both keyword and spaCy analysis
+        cleaned = clean_text(raw)
+
+        # Language detection and the NLP analyses are independent; spaCy
+        # runs once for both the summary sentences and the named entities
+        language_future = ex.submit(_detect_language, raw)
+        keywords_future = ex.submit(
+            extract_keywords, cleaned, top_n=keyword_count, is_clean=True
+        )
+        analysis_future = ex.submit(analyze, cleaned, is_clean=True, nlp=nlp)
+        sections_future = ex.submit(extract_sections, raw)
+
+        # Infer a title from the first text block
+        title = _detect_title(raw)
+
+        language = language_future.result()
+        keywords = keywords_future.result()
+        sentences, entities = analysis_future.result()
+        sections = sections_future.result()
+
+    summary = summarize_sentences(sentences, num_sentences=summary_sentences)
 
     # Derive basic file information
     filename = os.path.basename(path)  # e.g., 'document.pdf'
     _, ext = os.path.splitext(filename)  # split to get file extension
 
-    # Infer a title from the first text block
-    title = _detect_title(raw)
-
-    # Perform NLP-based metadata extraction
-    keywords = extract_keywords(raw, top_n=keyword_count)  
-    summary = extract_summary(raw, num_sentences=summary_sentences)  
-    entities = extract_entities(raw) 
-    sections = extract_sections(raw)  
-
-    # 6. Compute word count and reading time
-    word_count = len(raw.split()) 
+    # 6. Compute word count and reading time; words are counted by
+    # iterating regex matches rather than building a list of every word
+    word_count = sum(1 for _ in _WORD.finditer(raw))
     reading_time_min = round(word_count / wpm, 2)  # estimated minutes
 
     # 7. Consolidate all metadata into a single dict
@@ -1,8 +1,23 @@
-from typing import List, Tuple  # for type annotations
+from collections import Counter  # for keyword frequency counts
+from functools import lru_cache  # to memoize the lazily imported stopword list
+from typing import Dict, Iterable, List, Tuple  # for type annotations
 import re 
+import numpy as np  # for vectorized sentence scoring
 import streamlit  
-import spacy  # for NLP processing
-from sklearn.feature_extraction.text import TfidfVectorizer  # for keyword and summary extraction
+# spaCy and scikit-learn are heavy to import; they are loaded on first use
+# inside `load_nlp` / `_stop_words` rather than at module import
+
+# Precompiled patterns shared by the helpers below
+_WS = re.compile(r"\s+")  # any run of whitespace
+_ALLCAPS = re.compile(r'^[A-Z0-9 \-]+$')  # ALL CAPS heading candidate
+_NUMHEAD = re.compile(r'^\d+\. ?[A-Za-z].*')  # numbered heading, e.g. '1. Intro'
+# Word tokens considered as keyword candidates: runs of letters (any script;
+# digits-only tokens are not keywords), joined by inner hyphens or apostrophes
+_KEYWORD_TOKEN = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+# Clitic endings removed from keyword candidates ("company's" -> "company")
+_CLITIC = re.compile(r"'(?:s|re|ve|ll|d|m)$")
+# Terms used for sentence scoring (same default token pattern as scikit-learn)
+_SUMMARY_TOKEN = re.compile(r"(?u)\b\w\w+\b")
 
 
 @streamlit.cache_resource
@@ -10,15 +25,41 @@ def load_nlp():
     """
     Lazily load and cache the spaCy language model to avoid repeated loads.
 
+    Only the components used downstream are kept: the tagger, parser,
+    attribute ruler and lemmatizer are excluded, and the lightweight
+    `senter` replaces the parser for sentence boundaries. `ner` and `senter`
+    embed their own token vectors, so the shared `tok2vec` is dropped too
+    once nothing listens to it.
+
+    The returned pipeline is shared by every session, so helpers must not
+    reconfigure it (e.g. via `select_pipes`); they pass `disable=` per call.
+
     Returns:
         A spaCy Language object for processing English text.
     """
 
     import spacy
-    return spacy.load("en_core_web_sm")
+    model = spacy.load(
+        "en_core_web_sm",
+        exclude=["tagger", "parser", "attribute_ruler", "lemmatizer"],
+    )
+    model.enable_pipe("senter")  # disabled by default in the packaged model
+    # With tagger and parser gone, tok2vec output would only be discarded
+    if "tok2vec" in model.pipe_names and not model.get_pipe("tok2vec").listening_components:
+        model.remove_pipe("tok2vec")
+    return model
 
 
-nlp = load_nlp()
+def _only(nlp, *names: str) -> List[str]:
+    """Names of the pipeline components to disable so that only `names` run."""
+    return [name for name in nlp.pipe_names if name not in names]
+
+
+@lru_cache(maxsize=None)
+def _stop_words() -> frozenset:
+    """scikit-learn's English stopword list, imported on first use."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS
 
 
 def clean_text(text: str) -> str:
@@ -33,83 +74,211 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text with uniform spacing.
     """
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS.sub(" ", text).strip()
 
 
-def extract_keywords(text: str, top_n: int = 10) -> List[str]:
+def extract_keywords(text: str, top_n: int = 10, is_clean: bool = False) -> List[str]:
     """
-    Identify the top N keywords using unigram TF-IDF.
+    Identify the top N keywords by unigram frequency.
+
+    On a single document TF-IDF reduces to term frequency, so words are
+    counted directly instead of building a vectorizer.
 
     Steps:
-    1. Clean text (whitespace normalization).
-    2. Vectorize text into TF-IDF features, limited to top_n features.
-    3. Return the feature names (keywords).
+    1. Clean text (whitespace normalization) and lowercase it.
+    2. Count word tokens, skipping English stopwords, negated contractions
+       ("don't") and the stem left after stripping clitics ("it's" -> "it").
+    3. Return the top_n most frequent words, most frequent first.
 
     Parameters:
         text: input document text
         top_n: number of keywords to extract
+        is_clean: True if `text` already went through `clean_text`
     Returns:
         List of keyword strings
     """
-    cleaned = clean_text(text)
-    vect = TfidfVectorizer(stop_words="english", max_features=top_n)
-    tfidf = vect.fit_transform([cleaned])  # single-document TF-IDF
-    return vect.get_feature_names_out().tolist()
+    cleaned = text if is_clean else clean_text(text)
+    stop_words = _stop_words()
+    counter = Counter()
+    for word in _KEYWORD_TOKEN.findall(cleaned.lower().replace("\u2019", "'")):
+        if word.endswith("n't"):
+            continue
+        word = _CLITIC.sub("", word)
+        if len(word) > 1 and word not in stop_words:
+            counter[word] += 1
+    return [word for word, _ in counter.most_common(top_n)]
 
 
-def extract_summary(text: str, num_sentences: int = 3) -> str:
+def extract_summary(text: str, num_sentences: int = 3, is_clean: bool = False) -> str:
     """
     Generate an extractive summary by scoring and selecting sentences.
 
     Approach:
     1. Clean text and split into sentences via spaCy pipeline.
     2. If total sentences ≤ num_sentences, return the full text.
-    3. Otherwise, apply TF-IDF to sentence-level corpus.
-    4. Score each sentence by summing its TF-IDF values.
+    3. Otherwise, weight terms by TF-IDF over the sentence-level corpus.
+    4. Score each sentence by summing its (L2-normalized) TF-IDF values.
     5. Select the top num_sentences sentences and reconstruct summary
        in their original order.
 
     Parameters:
         text: document text to summarize
         num_sentences: number of sentences to include
+        is_clean: True if `text` already went through `clean_text`
     Returns:
         Concatenated sentences as the summary string.
     """
-    cleaned = clean_text(text)
-    doc = nlp(cleaned)  # process text for sentence segmentation
+    cleaned = text if is_clean else clean_text(text)
+    # Sentence segmentation only needs the senter component
+    nlp = load_nlp()
+    doc = nlp(cleaned, disable=_only(nlp, "senter"))
     sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+    return summarize_sentences(sentences, num_sentences=num_sentences)
+
+
+def _sentence_scores(sentences: List[str]) -> np.ndarray:
+    """
+    Score sentences by the sum of their L2-normalized TF-IDF weights.
+
+    Matches scikit-learn's TfidfVectorizer defaults (lowercasing, English
+    stopwords, smoothed IDF, L2 row norm) but works on flat
+    (sentence, term, count) arrays instead of building a sparse matrix.
+
+    Parameters:
+        sentences: sentence strings forming the corpus
+    Returns:
+        One float score per sentence.
+    """
+    n_sent = len(sentences)
+    stop_words = _stop_words()
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    counts: List[int] = []
+    for i, sent in enumerate(sentences):
+        terms = Counter(
+            term
+            for term in _SUMMARY_TOKEN.findall(sent.lower())
+            if term not in stop_words
+        )
+        for term, count in terms.items():
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            counts.append(count)
+
+    if not vocab:
+        return np.zeros(n_sent)
+
+    row_idx = np.asarray(rows, dtype=np.intp)
+    col_idx = np.asarray(cols, dtype=np.intp)
+    df = np.bincount(col_idx, minlength=len(vocab))  # sentences containing each term
+    idf = np.log((n_sent + 1) / (df + 1)) + 1
+    weights = np.asarray(counts, dtype=np.float64) * idf[col_idx]
+
+    # Per-sentence weight sum divided by the row's L2 norm
+    sums = np.bincount(row_idx, weights=weights, minlength=n_sent)
+    norms = np.sqrt(np.bincount(row_idx, weights=weights * weights, minlength=n_sent))
+    return np.divide(sums, norms, out=np.zeros(n_sent), where=norms > 0)
 
+
+def summarize_sentences(sentences: List[str], num_sentences: int = 3) -> str:
+    """
+    Build an extractive summary from already-segmented sentences.
+
+    Shared by `extract_summary` and callers that obtained sentences from
+    `analyze`, so the spaCy pipeline is not re-run just for scoring.
+
+    Parameters:
+        sentences: non-empty, stripped sentence strings in document order
+        num_sentences: number of sentences to include
+    Returns:
+        Concatenated sentences as the summary string.
+    """
     # Return early if not enough sentences
     if not sentences:
         return ""
     if len(sentences) <= num_sentences:
         return " ".join(sentences)
 
-    # Compute sentence-level TF-IDF
-    vect = TfidfVectorizer(stop_words="english")
-    tf = vect.fit_transform(sentences)
-    scores = tf.sum(axis=1).A1  # sum TF-IDF scores per sentence
+    # Sum sentence-level TF-IDF scores
+    scores = _sentence_scores(sentences)
 
-    # Identify top sentence indices
-    top_idxs = scores.argsort()[-num_sentences:][::-1]
+    # Identify top sentence indices in O(n) without fully sorting the scores
+    top_idxs = np.argpartition(scores, -num_sentences)[-num_sentences:]
     # Sort indices to preserve original order in summary
-    ordered = sorted(top_idxs)
+    ordered = np.sort(top_idxs)
     return " ".join(sentences[i] for i in ordered)
 
 
-def extract_entities(text: str) -> List[Tuple[str, str]]:
+def extract_entities(text: str, is_clean: bool = False) -> List[Tuple[str, str]]:
     """
     Perform named-entity recognition using spaCy.
 
     Parameters:
         text: document text for NER
+        is_clean: True if `text` already went through `clean_text`
     Returns:
         A list of tuples (entity_text, entity_label) for each detected entity.
     """
-    doc = nlp(clean_text(text))  
+    # NER only needs the ner component
+    nlp = load_nlp()
+    doc = nlp(text if is_clean else clean_text(text), disable=_only(nlp, "ner"))
     return [(ent.text, ent.label_) for ent in doc.ents]
 
 
+def _doc_results(doc) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Split a processed spaCy Doc into its sentences and entities."""
+    sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+    entities = [(ent.text, ent.label_) for ent in doc.ents]
+    return sentences, entities
+
+
+def analyze(
+    text: str,
+    is_clean: bool = False,
+    nlp=None
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Run the spaCy pipeline once and return both sentences and entities.
+
+    Equivalent to the segmentation in `extract_summary` plus
+    `extract_entities`, but the text is tokenized and processed only once.
+
+    Parameters:
+        text: document text to analyze
+        is_clean: True if `text` already went through `clean_text`
+        nlp: pipeline from `load_nlp`; pass it when calling from a worker
+            thread, since the Streamlit cache needs the script's own thread
+    Returns:
+        Tuple (sentences, entities): stripped sentence strings in order, and
+        (entity_text, entity_label) tuples.
+    """
+    if nlp is None:
+        nlp = load_nlp()
+    return _doc_results(nlp(text if is_clean else clean_text(text)))
+
+
+def analyze_batch(
+    texts: Iterable[str],
+    batch_size: int = 32,
+    n_process: int = 1
+) -> List[Tuple[List[str], List[Tuple[str, str]]]]:
+    """
+    Apply `analyze` to many documents using spaCy's batched `nlp.pipe`.
+
+    Parameters:
+        texts: document texts to analyze
+        batch_size: number of documents buffered per batch
+        n_process: worker processes for spaCy; raise it (or -1 for every CPU
+            core) only for large batches, as each process loads the model
+    Returns:
+        One (sentences, entities) tuple per input text, in input order.
+    """
+    cleaned = (clean_text(t) for t in texts)
+    docs = load_nlp().pipe(cleaned, batch_size=batch_size, n_process=n_process)
+    return [_doc_results(doc) for doc in docs]
+
+
 def extract_sections(text: str) -> List[str]:
     """
     Heuristic extraction of section headings from text based on formatting patterns.
@@ -125,6 +294,7 @@ def extract_sections(text: str) -> List[str]:
     Returns:
         List of detected section heading strings.
     """
+    seen = set()
     sections = []
     for line in text.splitlines():
         stripped = line.strip()
@@ -132,16 +302,18 @@ def extract_sections(text: str) -> List[str]:
         if not stripped or len(stripped) > 60:
             continue
 
-        if re.match(r'^[A-Z0-9 \-]+$', stripped) and any(c.isalpha() for c in stripped):
-            sections.append(stripped.title())
-       
-        elif re.match(r'^\d+\. ?[A-Za-z].*', stripped):
-            sections.append(stripped)
-    
-    seen = set()
-    unique = []
-    for sec in sections:
-        if sec not in seen:
-            seen.add(sec)
-            unique.append(sec)
-    return unique
+        # Cheap first-character check rejects ordinary paragraph lines
+        # before any regex runs
+        first = stripped[0]
+        heading = None
+        if "A" <= first <= "Z" or first.isdigit() or first == "-":
+            if _ALLCAPS.match(stripped) and any(c.isalpha() for c in stripped):
+                heading = stripped.title()
+            elif first.isdigit() and _NUMHEAD.match(stripped):
+                heading = stripped
+
+        # Deduplicate in the same pass, keeping first occurrence order
+        if heading is not None and heading not in seen:
+            seen.add(heading)
+            sections.append(heading)
+    return sections
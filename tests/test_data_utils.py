@@ -1,12 +1,42 @@
 import pytest
-from data_utils import extract_text
+from data_utils import extract_text, extract_text_and_metadata, get_file_metadata, _parse_pdf_date
 
-@pytest.mark.parametrize("fname", [
+SAMPLES = [
     "samples/example.txt",
     "samples/example.docx",
     "samples/example.pdf",
-])
+]
+
+@pytest.mark.parametrize("fname", SAMPLES)
 def test_extract_text_nonempty(fname):
     text = extract_text(fname)
     assert isinstance(text, str)
     assert len(text) > 0
+
+@pytest.mark.parametrize("fname", SAMPLES)
+def test_extract_text_from_bytes_matches_path(fname):
+    with open(fname, "rb") as f:
+        data = f.read()
+    assert extract_text(fname, data=data) == extract_text(fname)
+
+@pytest.mark.parametrize("fname", SAMPLES)
+def test_get_file_metadata_from_bytes_matches_path(fname):
+    with open(fname, "rb") as f:
+        data = f.read()
+    assert get_file_metadata(fname, data=data) == get_file_metadata(fname)
+
+@pytest.mark.parametrize("fname", SAMPLES)
+def test_extract_text_and_metadata_matches_separate_calls(fname):
+    with open(fname, "rb") as f:
+        data = f.read()
+    expected = (extract_text(fname), get_file_metadata(fname))
+    assert extract_text_and_metadata(fname) == expected
+    assert extract_text_and_metadata(fname, data=data) == expected
+
+@pytest.mark.parametrize("raw, expected", [
+    ("D:20240131093005+01'00'", "2024-01-31T09:30:05"),
+    ("20240131093005", "2024-01-31T09:30:05"),
+    ("D:not-a-date", "not-a-date"),
+])
+def test_parse_pdf_date(raw, expected):
+    assert _parse_pdf_date(raw) == expected
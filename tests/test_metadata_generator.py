@@ -1,7 +1,7 @@
 # tests/test_metadata_generator.py
 
 import pytest
-from metadata_generator import generate_metadata
+from metadata_generator import generate_metadata, _detect_title
 
 SAMPLES = [
     ("samples/example.txt", ".txt"),
@@ -56,3 +56,11 @@ def test_sections_field_present(tmp_path):
     # Sections should pick up exactly the three headings
     assert "sections" in meta
     assert meta["sections"] == ["Introduction", "1. First Section", "Conclusion"]
+
+def test_detect_title_reads_only_first_block():
+    text = "Annual Report\n2024 Edition\n\nBody text follows here.\n" + "filler " * 100000
+    assert _detect_title(text) == "Annual Report 2024 Edition"
+    # Whitespace-only lines also end the title block
+    assert _detect_title("Short Title\n   \nBody") == "Short Title"
+    # Long titles are truncated to max_words with an ellipsis
+    assert _detect_title(" ".join(["word"] * 30), max_words=5) == "word word word word word…"
@@ -0,0 +1,75 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from nlp_utils import _sentence_scores, analyze, analyze_batch, extract_keywords, extract_sections, summarize_sentences
+
+def test_summarize_sentences_short_input_returned_whole():
+    sentences = ["First sentence.", "Second sentence."]
+    assert summarize_sentences(sentences, num_sentences=3) == "First sentence. Second sentence."
+    assert summarize_sentences([], num_sentences=3) == ""
+
+def test_summarize_sentences_keeps_document_order():
+    sentences = [
+        "The cat sat.",
+        "Quantum entanglement links distant particles instantly.",
+        "It was.",
+        "Metadata extraction pipelines parse documents automatically.",
+    ]
+    summary = summarize_sentences(sentences, num_sentences=2)
+    # The two information-dense sentences win and keep their original order
+    assert summary == " ".join([sentences[1], sentences[3]])
+
+def test_analyze_batch_matches_analyze():
+    texts = [
+        "Alice Smith joined Google in London. She leads the search team.",
+        "The meeting is on Monday.   Paris hosts it\nthis year.",
+        "",
+    ]
+    assert analyze_batch(texts, batch_size=2) == [analyze(t) for t in texts]
+
+def test_extract_keywords_ordering_stopwords_and_top_n():
+    text = (
+        "Metadata   metadata metadata extraction. The extraction of the café "
+        "menu and the café     prices in 2024 2024 2024 2024 is well-known."
+    )
+    # Most frequent first; ties keep first-seen order
+    assert extract_keywords(text, top_n=3) == ["metadata", "extraction", "café"]
+    keywords = extract_keywords(text, top_n=10)
+    # Stopwords and purely numeric tokens are never keywords
+    assert not {"the", "of", "and", "in", "is", "2024"} & set(keywords)
+    assert "well-known" in keywords
+    assert len(extract_keywords(text, top_n=2)) == 2
+    # Contractions and possessives count under their stem; no stray - or '
+    text = (
+        "It's the company's plan. It\u2019s the company\u2019s goal, and it's "
+        "what we don't want for students' notes on extrac- tion."
+    )
+    keywords = extract_keywords(text, top_n=10)
+    assert keywords[0] == "company"
+    assert not {"it's", "it", "don't", "students'", "extrac-"} & set(keywords)
+    assert {"students", "extrac"} <= set(keywords)
+
+def test_extract_sections_single_pass_dedup():
+    text = "\n".join([
+        "INTRODUCTION",
+        "Some paragraph text that is not a heading.",
+        "1. Scope",
+        "2024 REPORT",
+        "- APPENDIX -",
+        "lowercase line",
+        "INTRODUCTION",
+        "1. Scope",
+    ])
+    # Duplicates are dropped, first occurrences keep document order
+    assert extract_sections(text) == ["Introduction", "1. Scope", "2024 Report", "- Appendix -"]
+
+def test_sentence_scores_match_sklearn_tfidf():
+    sentences = [
+        "Metadata extraction turns documents into structured records.",
+        "It is what it is, and that was all of it.",  # only stopwords
+        "Structured records make documents searchable, and searchable documents get read.",
+        "OCR 2.0 handles scanned PDFs; scanned PDFs need OCR.",
+    ]
+    expected = TfidfVectorizer(stop_words="english").fit_transform(sentences).sum(axis=1).A1
+    scores = _sentence_scores(sentences)
+    assert np.allclose(scores, expected)
+    assert scores[1] == 0.0